@@ -3,17 +3,9 @@ Main entry point for the Sales Analytics System.
 """
 
 import os
+import sys
 from utils.file_handler import read_sales_data, parse_transactions, validate_and_filter
-from utils.data_processor import (
-    calculate_total_revenue,
-    find_peak_sales_day,
-    daily_sales_trend,
-    region_wise_sales,
-    top_selling_products,
-    low_performing_products,
-    customer_analysis,
-    generate_sales_report
-)
+from utils.data_processor import analyze_all, generate_sales_report
 from utils.api_handler import (
     get_all_products,
     create_product_mapping,
@@ -22,10 +14,20 @@ from utils.api_handler import (
 )
 
 
-def main():
+def _silent(*args, **kwargs):
+    """
+    Stand-in for print() when progress output is disabled
+    """
+
+
+def main(verbose=True):
     """
     Main execution function
 
+    Args:
+        verbose (bool): Print progress messages (default: True). Prompts,
+            filter options and error messages are always printed.
+
     Workflow:
     1. Print welcome message
     2. Read sales data file (handle encoding)
@@ -87,42 +89,59 @@ def main():
     [10/10] Process Complete!
     ========================================
     """
+    # Progress output goes through log(), which does nothing in quiet mode;
+    # lines that need formatting or counting are also guarded by verbose
+    log = print if verbose else _silent
+
     try:
         # Welcome message
-        print("=" * 50)
-        print(" " * 15 + "SALES ANALYTICS SYSTEM")
-        print("=" * 50)
-        print()
+        log("=" * 50)
+        log(" " * 15 + "SALES ANALYTICS SYSTEM")
+        log("=" * 50)
+        log()
 
         # Step 1: Read sales data
-        print("[1/10] Reading sales data...")
+        log("[1/10] Reading sales data...")
         try:
             input_file = 'data/sales_data.txt'
             raw_lines = read_sales_data(input_file)
-            print(f"✓ Successfully read {len(raw_lines)} transactions")
+            if verbose:
+                log(f"✓ Successfully read {len(raw_lines)} transactions")
         except Exception as e:
             print(f"✗ Error reading sales data: {str(e)}")
             return
-        print()
+        log()
 
         # Step 2: Parse and clean transactions
-        print("[2/10] Parsing and cleaning data...")
+        log("[2/10] Parsing and cleaning data...")
         try:
             transactions = parse_transactions(raw_lines)
-            print(f"✓ Parsed {len(transactions)} records")
+            if verbose:
+                log(f"✓ Parsed {len(transactions)} records")
         except Exception as e:
             print(f"✗ Error parsing transactions: {str(e)}")
             return
-        print()
+        log()
 
         # Step 3: Display filter options
-        print("[3/10] Filter Options Available:")
+        log("[3/10] Filter Options Available:")
         try:
-            # Get available regions and amount range from transactions
-            regions = sorted(set(t.get('Region', '') for t in transactions if t.get('Region')))
-            amounts = [t.get('Quantity', 0) * t.get('UnitPrice', 0.0) for t in transactions]
-            min_amount = min(amounts) if amounts else 0
-            max_amount = max(amounts) if amounts else 0
+            # Get available regions and amount range from transactions in a single pass
+            seen_regions = set()
+            min_amount = float('inf')
+            max_amount = float('-inf')
+            for t in transactions:
+                region = t.get('Region')
+                if region:
+                    seen_regions.add(region)
+                amount = t.get('Quantity', 0) * t.get('UnitPrice', 0.0)
+                if amount < min_amount:
+                    min_amount = amount
+                if amount > max_amount:
+                    max_amount = amount
+            if not transactions:
+                min_amount = max_amount = 0
+            regions = sorted(seen_regions)
             
             print(f"Regions: {', '.join(regions)}")
             print(f"Amount Range: ₹{min_amount:,.2f} - ₹{max_amount:,.2f}")
@@ -160,96 +179,100 @@ def main():
             region_filter = None
             min_amount_filter = None
             max_amount_filter = None
-        print()
+        log()
 
         # Step 4: Validate transactions
-        print("[4/10] Validating transactions...")
+        log("[4/10] Validating transactions...")
         try:
             valid_transactions, invalid_count, filter_summary = validate_and_filter(
                 transactions,
                 region=region_filter,
                 min_amount=min_amount_filter,
-                max_amount=max_amount_filter
+                max_amount=max_amount_filter,
+                verbose=verbose
             )
-            print(f"✓ Valid: {len(valid_transactions)} | Invalid: {invalid_count}")
+            if verbose:
+                log(f"✓ Valid: {len(valid_transactions)} | Invalid: {invalid_count}")
         except Exception as e:
             print(f"✗ Error validating transactions: {str(e)}")
             valid_transactions = transactions
-        print()
+        log()
 
         # Step 5: Perform data analyses
-        print("[5/10] Analyzing sales data...")
+        log("[5/10] Analyzing sales data...")
+        analysis = None
         try:
-            # Call all analysis functions (they're called internally by generate_sales_report)
-            # But we can call them here to ensure they work
-            total_revenue = calculate_total_revenue(valid_transactions)
-            peak_day = find_peak_sales_day(valid_transactions)
-            daily_trend = daily_sales_trend(valid_transactions)
-            region_stats = region_wise_sales(valid_transactions)
-            top_products = top_selling_products(valid_transactions, n=5)
-            low_products = low_performing_products(valid_transactions, threshold=10)
-            customer_stats = customer_analysis(valid_transactions)
-            print("✓ Analysis complete")
+            # Run all analyses over one shared column view (columns and groupings built once)
+            analysis = analyze_all(valid_transactions, top_n=5, low_threshold=10)
+            log("✓ Analysis complete")
         except Exception as e:
             print(f"✗ Error in analysis: {str(e)}")
-        print()
+        log()
 
         # Step 6: Fetch products from API
-        print("[6/10] Fetching product data from API...")
+        log("[6/10] Fetching product data from API...")
         try:
             api_response = get_all_products()
             products_list = api_response.get('products', [])
-            print(f"✓ Fetched {len(products_list)} products")
+            if verbose:
+                log(f"✓ Fetched {len(products_list)} products")
         except Exception as e:
             print(f"✗ Error fetching products from API: {str(e)}")
             print("  Continuing without API enrichment...")
             products_list = []
-        print()
+        log()
 
         # Step 7: Enrich sales data
-        print("[7/10] Enriching sales data...")
-        enriched_transactions = valid_transactions.copy()
+        log("[7/10] Enriching sales data...")
+        # Falls back to the validated transactions (read-only below) if enrichment fails
+        enriched_transactions = valid_transactions
         try:
             if products_list:
                 product_mapping = create_product_mapping(api_response)
                 enriched_transactions = enrich_sales_data(valid_transactions, product_mapping)
-                enriched_count = sum(1 for t in enriched_transactions if t.get('API_Match', False))
-                success_rate = (enriched_count / len(enriched_transactions) * 100) if enriched_transactions else 0
-                print(f"✓ Enriched {enriched_count}/{len(enriched_transactions)} transactions ({success_rate:.1f}%)")
+                if verbose:
+                    enriched_count = sum(1 for t in enriched_transactions if t.get('API_Match', False))
+                    success_rate = (enriched_count / len(enriched_transactions) * 100) if enriched_transactions else 0
+                    log(f"✓ Enriched {enriched_count}/{len(enriched_transactions)} transactions ({success_rate:.1f}%)")
             else:
-                print("⚠ Skipped (no API data available)")
+                log("⚠ Skipped (no API data available)")
         except Exception as e:
             print(f"✗ Error enriching data: {str(e)}")
             print("  Using original transactions...")
-        print()
+        log()
 
         # Step 8: Save enriched data
-        print("[8/10] Saving enriched data...")
+        log("[8/10] Saving enriched data...")
         try:
             save_enriched_data(enriched_transactions, 'data/enriched_sales_data.txt')
-            print("✓ Saved to: data/enriched_sales_data.txt")
+            log("✓ Saved to: data/enriched_sales_data.txt")
         except Exception as e:
             print(f"✗ Error saving enriched data: {str(e)}")
-        print()
+        log()
 
         # Step 9: Generate report
-        print("[9/10] Generating report...")
+        log("[9/10] Generating report...")
         try:
-            generate_sales_report(valid_transactions, enriched_transactions, 'output/sales_report.txt')
-            print("✓ Report saved to: output/sales_report.txt")
+            generate_sales_report(
+                valid_transactions,
+                enriched_transactions,
+                'output/sales_report.txt',
+                analysis=analysis
+            )
+            log("✓ Report saved to: output/sales_report.txt")
         except Exception as e:
             print(f"✗ Error generating report: {str(e)}")
-        print()
+        log()
 
         # Step 10: Success message
-        print("[10/10] Process Complete!")
-        print("=" * 50)
-        print()
-        print("Generated Files:")
-        print("  - data/enriched_sales_data.txt")
-        print("  - output/sales_report.txt")
-        print()
-        print("Thank you for using Sales Analytics System!")
+        log("[10/10] Process Complete!")
+        log("=" * 50)
+        log()
+        log("Generated Files:")
+        log("  - data/enriched_sales_data.txt")
+        log("  - output/sales_report.txt")
+        log()
+        log("Thank you for using Sales Analytics System!")
 
     except KeyboardInterrupt:
         print("\n\nProcess interrupted by user.")
@@ -258,4 +281,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(verbose='--quiet' not in sys.argv[1:])
@@ -1,22 +1,98 @@
+import copy
+import functools
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from utils.file_handler import ensure_parent_dir
+
+# Use orjson for parsing API responses when it is installed (faster than stdlib json)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Matches the numeric part of ProductIDs such as 'P101' or 'p5'
+_PRODUCT_ID_RE = re.compile(r'P(\d+)', re.IGNORECASE)
+
+# Shared session so API calls reuse pooled connections instead of a new TLS handshake each
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_maxsize=20))
+
+# API fields for transactions whose product isn't in the mapping
+_UNMATCHED_API_FIELDS = {
+    'API_Category': None,
+    'API_Brand': None,
+    'API_Rating': None,
+    'API_Match': False
+}
+
+# Header row of the enriched sales data file
+_ENRICHED_HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region|API_Category|API_Brand|API_Rating|API_Match\n"
+
+
+def _disk_memoize(path, ttl):
+    """
+    Caches the JSON result of a no-argument function on disk
+    
+    Args:
+        path (str): Cache file location
+        ttl (int): Seconds a cached result stays fresh (based on file mtime)
+    
+    A missing, stale or unreadable cache file falls through to the real call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper():
+            try:
+                if time.time() - os.path.getmtime(path) < ttl:
+                    with open(path, 'r', encoding='utf-8') as file:
+                        return json.load(file)
+            except (OSError, ValueError):
+                # No usable cache - fetch fresh data
+                pass
+            
+            result = func()
+            
+            try:
+                ensure_parent_dir(path)
+                with open(path, 'w', encoding='utf-8') as file:
+                    json.dump(result, file)
+            except OSError:
+                # Caching is best-effort; the fresh result is still returned
+                pass
+            
+            return result
+        return wrapper
+    return decorator
 
 
+@_disk_memoize(path='.cache/products.json', ttl=3600)
 def get_all_products():
     """
     Retrieves all products from DummyJSON API (returns first 30 by default)
     
+    The response is cached in '.cache/products.json' for one hour.
+    
     Returns:
         dict: Response containing 'products' list and 'total' count
         Example: {'products': [...], 'total': 100}
     """
     try:
-        response = requests.get('https://dummyjson.com/products')
+        response = _SESSION.get('https://dummyjson.com/products')
         response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
+        data = _json_loads(response.content)
         # data['products'] contains list of all products
         # data['total'] gives total count
         return data
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         raise Exception(f"Error fetching all products: {str(e)}")
 
 
@@ -29,17 +105,43 @@ def get_product_by_id(product_id):
     
     Returns:
         dict: Single product object
+    
+    Results are cached for the rest of the run (5 and '5' share an entry);
+    each call returns its own copy, so callers can modify it freely.
+    """
+    return copy.deepcopy(_fetch_product(str(product_id).strip()))
+
+
+@functools.lru_cache(maxsize=512)
+def _fetch_product(product_id):
+    """
+    Fetches a single product; product_id is the normalized string form
     """
     try:
-        response = requests.get(f'https://dummyjson.com/products/{product_id}')
+        response = _SESSION.get(f'https://dummyjson.com/products/{product_id}')
         response.raise_for_status()  # Raise an exception for bad status codes
-        product = response.json()
+        product = _json_loads(response.content)
         # Returns single product object
         return product
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         raise Exception(f"Error fetching product {product_id}: {str(e)}")
 
 
+def get_products_bulk(product_ids, max_workers=10):
+    """
+    Fetches details for several products concurrently
+    
+    Args:
+        product_ids (list): Product identifiers (int or str)
+        max_workers (int): Maximum number of parallel requests (default: 10)
+    
+    Returns:
+        list: Product objects in the same order as product_ids
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get_product_by_id, product_ids))
+
+
 def get_products_with_limit(limit):
     """
     Retrieves a custom number of products, overriding the default limit of 30
@@ -51,11 +153,11 @@ def get_products_with_limit(limit):
         dict: Response containing 'products' list and 'total' count
     """
     try:
-        response = requests.get(f'https://dummyjson.com/products?limit={limit}')
+        response = _SESSION.get(f'https://dummyjson.com/products?limit={limit}')
         response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
+        data = _json_loads(response.content)
         return data
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         raise Exception(f"Error fetching products with limit {limit}: {str(e)}")
 
 
@@ -68,13 +170,25 @@ def search_products(query):
     
     Returns:
         dict: Response containing 'products' list matching the search query
+    
+    Results are cached per query for the rest of the run; each call returns
+    its own copy, so callers can modify it freely.
+    """
+    # Key the cache on the query text used in the URL, so any query value works
+    return copy.deepcopy(_search_products(f'{query}'))
+
+
+@functools.lru_cache(maxsize=512)
+def _search_products(query):
+    """
+    Runs a product search; query is the search term as it appears in the URL
     """
     try:
-        response = requests.get(f'https://dummyjson.com/products/search?q={query}')
+        response = _SESSION.get(f'https://dummyjson.com/products/search?q={query}')
         response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
+        data = _json_loads(response.content)
         return data
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         raise Exception(f"Error searching products with query '{query}': {str(e)}")
 
 
@@ -118,6 +232,46 @@ def create_product_mapping(api_products):
     return product_mapping
 
 
+def _extract_numeric_id(product_id):
+    """
+    Extracts the numeric part of a ProductID (P101 → 101, P5 → 5)
+    
+    Returns: int, or None if the ProductID doesn't contain a numeric ID
+    """
+    product_id_str = str(product_id).strip()
+    
+    # Fast path for the common 'P<digits>' form
+    if product_id_str[:1] in ('P', 'p') and product_id_str[1:].isdecimal():
+        return int(product_id_str[1:])
+    
+    # Fall back to the regex for unusual inputs (e.g. other prefixes)
+    match = _PRODUCT_ID_RE.search(product_id_str)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def _resolve_api_fields(product_id, product_mapping):
+    """
+    Returns the API_* fields for a ProductID, or the unmatched defaults
+    """
+    # Extract numeric ID from ProductID (P101 → 101, P5 → 5)
+    numeric_id = _extract_numeric_id(product_id)
+    
+    # Look up in product_mapping (single hash lookup; None IDs never match)
+    product_info = product_mapping.get(numeric_id)
+    if product_info is not None:
+        return {
+            'API_Category': product_info.get('category', ''),
+            'API_Brand': product_info.get('brand', ''),
+            'API_Rating': product_info.get('rating', 0.0),
+            'API_Match': True
+        }
+    
+    # ID doesn't exist in mapping
+    return _UNMATCHED_API_FIELDS
+
+
 def enrich_sales_data(transactions, product_mapping):
     """
     Enriches transaction data with API product information
@@ -152,83 +306,22 @@ def enrich_sales_data(transactions, product_mapping):
     - Handle all errors gracefully
 
     File Output:
-    - Save enriched data to 'data/enriched_sales_data.txt'
-    - Use same pipe-delimited format
-    - Include new columns in header
+    - None; use save_enriched_data() to write the enriched transactions
     """
-    import os
-    import re
-    
     enriched_transactions = []
     
+    # API fields resolved per raw ProductID, so repeated products skip the parse and lookup
+    resolved = {}
+    
     for transaction in transactions:
-        # Create a copy of the transaction to avoid modifying the original
-        enriched_transaction = transaction.copy()
-        
-        # Extract numeric ID from ProductID (P101 → 101, P5 → 5)
-        product_id_str = str(transaction.get('ProductID', ''))
+        product_id = transaction.get('ProductID', '')
         
-        # Try to extract numeric part from ProductID
-        numeric_id = None
-        try:
-            # Match pattern like P101, P5, etc.
-            match = re.search(r'P(\d+)', product_id_str, re.IGNORECASE)
-            if match:
-                numeric_id = int(match.group(1))
-        except (ValueError, AttributeError):
-            pass
+        api_fields = resolved.get(product_id)
+        if api_fields is None:
+            api_fields = resolved[product_id] = _resolve_api_fields(product_id, product_mapping)
         
-        # Look up in product_mapping
-        if numeric_id is not None and numeric_id in product_mapping:
-            product_info = product_mapping[numeric_id]
-            enriched_transaction['API_Category'] = product_info.get('category', '')
-            enriched_transaction['API_Brand'] = product_info.get('brand', '')
-            enriched_transaction['API_Rating'] = product_info.get('rating', 0.0)
-            enriched_transaction['API_Match'] = True
-        else:
-            # ID doesn't exist in mapping
-            enriched_transaction['API_Category'] = None
-            enriched_transaction['API_Brand'] = None
-            enriched_transaction['API_Rating'] = None
-            enriched_transaction['API_Match'] = False
-        
-        enriched_transactions.append(enriched_transaction)
-    
-    # Save enriched data to file
-    output_file = 'data/enriched_sales_data.txt'
-    
-    # Create data directory if it doesn't exist
-    os.makedirs('data', exist_ok=True)
-    
-    # Write header with new columns
-    header = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region|API_Category|API_Brand|API_Rating|API_Match\n"
-    
-    # Write enriched transactions
-    with open(output_file, 'w', encoding='utf-8') as file:
-        file.write(header)
-        
-        for transaction in enriched_transactions:
-            # Format None values as empty strings for file output
-            api_category = transaction.get('API_Category') if transaction.get('API_Category') is not None else ''
-            api_brand = transaction.get('API_Brand') if transaction.get('API_Brand') is not None else ''
-            api_rating = transaction.get('API_Rating') if transaction.get('API_Rating') is not None else ''
-            api_match = transaction.get('API_Match', False)
-            
-            line = (
-                f"{transaction.get('TransactionID', '')}|"
-                f"{transaction.get('Date', '')}|"
-                f"{transaction.get('ProductID', '')}|"
-                f"{transaction.get('ProductName', '')}|"
-                f"{transaction.get('Quantity', '')}|"
-                f"{transaction.get('UnitPrice', '')}|"
-                f"{transaction.get('CustomerID', '')}|"
-                f"{transaction.get('Region', '')}|"
-                f"{api_category}|"
-                f"{api_brand}|"
-                f"{api_rating}|"
-                f"{api_match}\n"
-            )
-            file.write(line)
+        # Build the copy and the API fields in one step (original is not modified)
+        enriched_transactions.append({**transaction, **api_fields})
     
     return enriched_transactions
 
@@ -250,47 +343,41 @@ def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data
     - Pipe-delimited format
     - Handle None values appropriately
     """
-    import os
-    
     # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
-    
-    # Write header with all columns
-    header = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region|API_Category|API_Brand|API_Rating|API_Match\n"
+    ensure_parent_dir(filename)
     
-    # Write enriched transactions to file
+    # Write enriched transactions to file, one line at a time
     with open(filename, 'w', encoding='utf-8') as file:
-        file.write(header)
+        write = file.write
+        write(_ENRICHED_HEADER)
         
         for transaction in enriched_transactions:
+            # Bind the lookup once; itemgetter would raise on missing keys
+            get = transaction.get
+            
             # Format None values as empty strings for file output
-            api_category = transaction.get('API_Category') if transaction.get('API_Category') is not None else ''
-            api_brand = transaction.get('API_Brand') if transaction.get('API_Brand') is not None else ''
-            api_rating = transaction.get('API_Rating') if transaction.get('API_Rating') is not None else ''
-            api_match = transaction.get('API_Match', False)
+            api_category = get('API_Category')
+            api_brand = get('API_Brand')
+            api_rating = get('API_Rating')
+            if api_category is None:
+                api_category = ''
+            if api_brand is None:
+                api_brand = ''
+            if api_rating is None:
+                api_rating = ''
             
             # Handle None values for original fields as well
-            transaction_id = transaction.get('TransactionID', '') or ''
-            date = transaction.get('Date', '') or ''
-            product_id = transaction.get('ProductID', '') or ''
-            product_name = transaction.get('ProductName', '') or ''
-            quantity = transaction.get('Quantity', '') or ''
-            unit_price = transaction.get('UnitPrice', '') or ''
-            customer_id = transaction.get('CustomerID', '') or ''
-            region = transaction.get('Region', '') or ''
-            
-            line = (
-                f"{transaction_id}|"
-                f"{date}|"
-                f"{product_id}|"
-                f"{product_name}|"
-                f"{quantity}|"
-                f"{unit_price}|"
-                f"{customer_id}|"
-                f"{region}|"
+            write(
+                f"{get('TransactionID', '') or ''}|"
+                f"{get('Date', '') or ''}|"
+                f"{get('ProductID', '') or ''}|"
+                f"{get('ProductName', '') or ''}|"
+                f"{get('Quantity', '') or ''}|"
+                f"{get('UnitPrice', '') or ''}|"
+                f"{get('CustomerID', '') or ''}|"
+                f"{get('Region', '') or ''}|"
                 f"{api_category}|"
                 f"{api_brand}|"
                 f"{api_rating}|"
-                f"{api_match}\n"
+                f"{get('API_Match', False)}\n"
             )
-            file.write(line)
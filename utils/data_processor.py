@@ -1,3 +1,152 @@
+import heapq
+from collections import defaultdict
+from itertools import islice
+
+from utils.file_handler import ensure_parent_dir
+
+
+class TransactionColumns:
+    """
+    Column-oriented view of a list of transactions
+
+    Each column is extracted (and cleaned) once, on first use, so the analysis
+    functions don't each re-read the same dictionary fields. Every analysis
+    function in this module accepts either transaction dictionaries (any
+    iterable) or a TransactionColumns; build one up front when running several analyses.
+
+    Columns (parallel lists, one entry per transaction):
+        dates: Date values (stripped)
+        regions: Region values (stripped)
+        products: ProductName values (stripped)
+        customers: CustomerID values (stripped)
+        quantities: Quantity values
+        revenues: Quantity * UnitPrice
+    """
+
+    __slots__ = ('_transactions', '_columns')
+
+    def __init__(self, transactions):
+        # Each column re-reads the transactions, so one-shot iterables
+        # (generators, iterators) are copied into a list first
+        if not isinstance(transactions, (list, tuple)):
+            transactions = list(transactions)
+        self._transactions = transactions
+        self._columns = {}
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def _text_column(self, field):
+        column = self._columns.get(field)
+        if column is None:
+            column = self._columns[field] = [t.get(field, '').strip() for t in self._transactions]
+        return column
+
+    @property
+    def dates(self):
+        return self._text_column('Date')
+
+    @property
+    def regions(self):
+        return self._text_column('Region')
+
+    @property
+    def products(self):
+        return self._text_column('ProductName')
+
+    @property
+    def customers(self):
+        return self._text_column('CustomerID')
+
+    @property
+    def quantities(self):
+        column = self._columns.get('Quantity')
+        if column is None:
+            column = self._columns['Quantity'] = [t.get('Quantity', 0) for t in self._transactions]
+        return column
+
+    def revenue_by(self, name):
+        """
+        Groups revenue by one of the text columns
+
+        Args:
+            name (str): 'dates', 'regions', 'products' or 'customers'
+
+        Returns: tuple (revenue, count, total)
+        - revenue: dict of total revenue per key, in first-seen order
+        - count: dict of transaction count per key
+        - total: revenue of all grouped transactions
+
+        Transactions with an empty key are skipped. The grouping is computed
+        once per view and shared between callers, so don't modify the result.
+        """
+        cache_key = ('revenue_by', name)
+        grouped = self._columns.get(cache_key)
+        if grouped is None:
+            revenue = {}
+            count = {}
+            revenue_get = revenue.get
+            count_get = count.get
+            total = 0.0
+            for key, value in zip(getattr(self, name), self.revenues):
+                # Skip transactions with an empty key
+                if not key:
+                    continue
+                revenue[key] = revenue_get(key, 0.0) + value
+                count[key] = count_get(key, 0) + 1
+                total += value
+            grouped = self._columns[cache_key] = (revenue, count, total)
+        return grouped
+
+    def product_totals(self):
+        """
+        Totals quantity and revenue per product in a single pass
+
+        Returns: tuple (quantity, revenue) of dicts keyed by product name, in
+        first-seen order. Transactions with an empty product name are skipped.
+        Cached like revenue_by(), so don't modify the result.
+        """
+        totals = self._columns.get('product_totals')
+        if totals is None:
+            quantity = {}
+            revenue = {}
+            quantity_get = quantity.get
+            revenue_get = revenue.get
+            for product_name, product_quantity, value in zip(self.products, self.quantities, self.revenues):
+                # Skip transactions with empty product name
+                if not product_name:
+                    continue
+                quantity[product_name] = quantity_get(product_name, 0) + product_quantity
+                revenue[product_name] = revenue_get(product_name, 0.0) + value
+            totals = self._columns['product_totals'] = (quantity, revenue)
+        return totals
+
+    @property
+    def revenues(self):
+        column = self._columns.get('Revenue')
+        if column is None:
+            column = self._columns['Revenue'] = [
+                t.get('Quantity', 0) * t.get('UnitPrice', 0.0) for t in self._transactions
+            ]
+        return column
+
+
+def _as_columns(transactions):
+    """
+    Returns transactions as TransactionColumns, building the view only if needed
+    """
+    if isinstance(transactions, TransactionColumns):
+        return transactions
+    return TransactionColumns(transactions)
+
+
+def _format_currency(amount):
+    """
+    Formats an amount as rupees with thousands separators (1234.5 → ₹1,234.50)
+    """
+    return f"₹{amount:,.2f}"
+
+
 def calculate_total_revenue(transactions):
     """
     Calculates total revenue from all transactions
@@ -7,12 +156,7 @@ def calculate_total_revenue(transactions):
     """
     total_revenue = 0.0
     
-    for transaction in transactions:
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        
-        # Calculate revenue for this transaction
-        revenue = quantity * unit_price
+    for revenue in _as_columns(transactions).revenues:
         total_revenue += revenue
     
     return total_revenue
@@ -25,42 +169,17 @@ def find_peak_sales_day(transactions):
     Returns: tuple (date, revenue, transaction_count)
     Expected Output Format: ('2024-12-15', 185000.0, 12)
     """
-    date_stats = {}
-    
-    # Aggregate revenue and transaction count by date
-    for transaction in transactions:
-        date = transaction.get('Date', '').strip()
-        
-        # Skip transactions with empty date
-        if not date:
-            continue
-        
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        revenue = quantity * unit_price
-        
-        # Initialize date if not exists
-        if date not in date_stats:
-            date_stats[date] = {
-                'total_revenue': 0.0,
-                'transaction_count': 0
-            }
-        
-        # Update date statistics
-        date_stats[date]['total_revenue'] += revenue
-        date_stats[date]['transaction_count'] += 1
+    # Revenue and transaction count per date (shared with daily_sales_trend)
+    date_revenue, date_count, _ = _as_columns(transactions).revenue_by('dates')
     
     # Find the date with highest revenue
-    if not date_stats:
+    if not date_revenue:
         return (None, 0.0, 0)
     
-    peak_date = max(
-        date_stats.items(),
-        key=lambda x: x[1]['total_revenue']
-    )
+    # The bound dict.get runs in C, unlike a per-item lambda
+    date = max(date_revenue, key=date_revenue.get)
     
-    date, stats = peak_date
-    return (date, stats['total_revenue'], stats['transaction_count'])
+    return (date, date_revenue[date], date_count[date])
 
 
 def daily_sales_trend(transactions):
@@ -86,48 +205,29 @@ def daily_sales_trend(transactions):
     - Count unique customers per day
     - Sort chronologically
     """
-    date_stats = {}
+    columns = _as_columns(transactions)
     
-    # Group by date and calculate metrics
-    for transaction in transactions:
-        date = transaction.get('Date', '').strip()
-        
-        # Skip transactions with empty date
-        if not date:
+    # Revenue and transaction count per date (shared with find_peak_sales_day)
+    date_revenue, date_count, _ = columns.revenue_by('dates')
+    
+    # Collect unique customers per date (defaultdict creates each set on first use)
+    date_customers = defaultdict(set)
+    for date, customer_id in zip(columns.dates, columns.customers):
+        # Skip transactions with empty date or customer ID
+        if not date or not customer_id:
             continue
         
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        revenue = quantity * unit_price
-        customer_id = transaction.get('CustomerID', '').strip()
-        
-        # Initialize date if not exists
-        if date not in date_stats:
-            date_stats[date] = {
-                'revenue': 0.0,
-                'transaction_count': 0,
-                'unique_customers': set()
-            }
-        
-        # Update date statistics
-        date_stats[date]['revenue'] += revenue
-        date_stats[date]['transaction_count'] += 1
-        
-        # Add customer to unique customers set if customer_id exists
-        if customer_id:
-            date_stats[date]['unique_customers'].add(customer_id)
-    
-    # Convert sets to counts and prepare final dictionary
-    result = {}
-    for date in sorted(date_stats.keys()):  # Sort chronologically
-        stats = date_stats[date]
-        result[date] = {
-            'revenue': stats['revenue'],
-            'transaction_count': stats['transaction_count'],
-            'unique_customers': len(stats['unique_customers'])
+        date_customers[date].add(customer_id)
+    
+    # Build the chronologically sorted result in one pass over the sorted dates
+    return {
+        date: {
+            'revenue': date_revenue[date],
+            'transaction_count': date_count[date],
+            'unique_customers': len(date_customers.get(date, ()))
         }
-    
-    return result
+        for date in sorted(date_revenue)
+    }
 
 
 def region_wise_sales_analysis(transactions):
@@ -146,31 +246,15 @@ def region_wise_sales_analysis(transactions):
         'West': {'total_revenue': 90000.10, 'transaction_count': 15}
     }
     """
-    region_stats = {}
-    
-    for transaction in transactions:
-        region = transaction.get('Region', '').strip()
-        
-        # Skip transactions with empty region
-        if not region:
-            continue
-        
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        revenue = quantity * unit_price
-        
-        # Initialize region if not exists
-        if region not in region_stats:
-            region_stats[region] = {
-                'total_revenue': 0.0,
-                'transaction_count': 0
-            }
-        
-        # Update region statistics
-        region_stats[region]['total_revenue'] += revenue
-        region_stats[region]['transaction_count'] += 1
+    region_revenue, region_count, _ = _as_columns(transactions).revenue_by('regions')
     
-    return region_stats
+    return {
+        region: {
+            'total_revenue': revenue,
+            'transaction_count': region_count[region]
+        }
+        for region, revenue in region_revenue.items()
+    }
 
 
 def region_wise_sales(transactions):
@@ -191,40 +275,22 @@ def region_wise_sales(transactions):
     - Calculate percentage of total sales
     - Sort by total_sales in descending order
     """
-    region_stats = {}
-    total_all_sales = 0.0
-    
-    # First pass: Calculate total sales per region and overall total
-    for transaction in transactions:
-        region = transaction.get('Region', '').strip()
-        
-        # Skip transactions with empty region
-        if not region:
-            continue
-        
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        sales = quantity * unit_price
-        
-        # Initialize region if not exists
-        if region not in region_stats:
-            region_stats[region] = {
-                'total_sales': 0.0,
-                'transaction_count': 0
-            }
-        
-        # Update region statistics
-        region_stats[region]['total_sales'] += sales
-        region_stats[region]['transaction_count'] += 1
-        total_all_sales += sales
+    # Total sales and transaction count per region, plus overall total
+    region_sales, region_count, total_all_sales = _as_columns(transactions).revenue_by('regions')
     
-    # Second pass: Calculate percentage for each region
-    for region in region_stats:
+    # Calculate percentage of total sales for each region
+    region_stats = {}
+    for region, sales in region_sales.items():
         if total_all_sales > 0:
-            percentage = (region_stats[region]['total_sales'] / total_all_sales) * 100
-            region_stats[region]['percentage'] = round(percentage, 2)
+            percentage = round((sales / total_all_sales) * 100, 2)
         else:
-            region_stats[region]['percentage'] = 0.0
+            percentage = 0.0
+        
+        region_stats[region] = {
+            'total_sales': sales,
+            'transaction_count': region_count[region],
+            'percentage': percentage
+        }
     
     # Sort by total_sales in descending order
     sorted_region_stats = dict(
@@ -258,42 +324,17 @@ def top_selling_products(transactions, n=5):
     - Sort by TotalQuantity descending
     - Return top n products
     """
-    product_stats = {}
-    
-    # Aggregate by ProductName
-    for transaction in transactions:
-        product_name = transaction.get('ProductName', '').strip()
-        
-        # Skip transactions with empty product name
-        if not product_name:
-            continue
-        
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        revenue = quantity * unit_price
-        
-        # Initialize product if not exists
-        if product_name not in product_stats:
-            product_stats[product_name] = {
-                'total_quantity': 0,
-                'total_revenue': 0.0
-            }
-        
-        # Update product statistics
-        product_stats[product_name]['total_quantity'] += quantity
-        product_stats[product_name]['total_revenue'] += revenue
+    # Quantity and revenue per product (shared with low_performing_products)
+    product_quantity, product_revenue = _as_columns(transactions).product_totals()
     
     # Convert to list of tuples and sort by TotalQuantity descending
     product_list = [
-        (product_name, stats['total_quantity'], stats['total_revenue'])
-        for product_name, stats in product_stats.items()
+        (product_name, quantity, product_revenue[product_name])
+        for product_name, quantity in product_quantity.items()
     ]
     
-    # Sort by TotalQuantity (index 1) in descending order
-    product_list.sort(key=lambda x: x[1], reverse=True)
-    
-    # Return top n products
-    return product_list[:n]
+    # Return top n products by TotalQuantity (index 1), without sorting the full list
+    return heapq.nlargest(n, product_list, key=lambda x: x[1])
 
 
 def low_performing_products(transactions, threshold=10):
@@ -317,36 +358,14 @@ def low_performing_products(transactions, threshold=10):
     - Include total quantity and revenue
     - Sort by TotalQuantity ascending
     """
-    product_stats = {}
-    
-    # Aggregate by ProductName
-    for transaction in transactions:
-        product_name = transaction.get('ProductName', '').strip()
-        
-        # Skip transactions with empty product name
-        if not product_name:
-            continue
-        
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        revenue = quantity * unit_price
-        
-        # Initialize product if not exists
-        if product_name not in product_stats:
-            product_stats[product_name] = {
-                'total_quantity': 0,
-                'total_revenue': 0.0
-            }
-        
-        # Update product statistics
-        product_stats[product_name]['total_quantity'] += quantity
-        product_stats[product_name]['total_revenue'] += revenue
+    # Quantity and revenue per product (shared with top_selling_products)
+    product_quantity, product_revenue = _as_columns(transactions).product_totals()
     
     # Filter products with total quantity < threshold
     low_performing = [
-        (product_name, stats['total_quantity'], stats['total_revenue'])
-        for product_name, stats in product_stats.items()
-        if stats['total_quantity'] < threshold
+        (product_name, quantity, product_revenue[product_name])
+        for product_name, quantity in product_quantity.items()
+        if quantity < threshold
     ]
     
     # Sort by TotalQuantity (index 1) in ascending order
@@ -384,43 +403,77 @@ def customer_analysis(transactions):
     - Count transactions per customer
     - Calculate average transaction value
     """
-    customer_stats = {}
+    # Total spent and transaction count per customer (same grouping as the other analyses)
+    customer_revenue, customer_count, _ = _as_columns(transactions).revenue_by('customers')
+    
+    # Build fresh per-customer dicts; the shared grouping itself is left untouched
+    customer_stats = {
+        customer_id: {
+            'total_spent': total_spent,
+            'transaction_count': customer_count[customer_id]
+        }
+        for customer_id, total_spent in customer_revenue.items()
+    }
     
-    for transaction in transactions:
-        customer_id = transaction.get('CustomerID', '').strip()
-        
-        # Skip transactions with empty customer ID
-        if not customer_id:
-            continue
-        
-        quantity = transaction.get('Quantity', 0)
-        unit_price = transaction.get('UnitPrice', 0.0)
-        transaction_value = quantity * unit_price
-        
-        # Initialize customer if not exists
-        if customer_id not in customer_stats:
-            customer_stats[customer_id] = {
-                'total_spent': 0.0,
-                'transaction_count': 0
-            }
-        
-        # Update customer statistics
-        customer_stats[customer_id]['total_spent'] += transaction_value
-        customer_stats[customer_id]['transaction_count'] += 1
-    
-    # Calculate average transaction value for each customer
-    for customer_id in customer_stats:
-        transaction_count = customer_stats[customer_id]['transaction_count']
-        if transaction_count > 0:
-            avg_value = customer_stats[customer_id]['total_spent'] / transaction_count
-            customer_stats[customer_id]['avg_transaction_value'] = round(avg_value, 2)
-        else:
-            customer_stats[customer_id]['avg_transaction_value'] = 0.0
+    return _finalize_customer_stats(customer_stats)
+
+
+def _finalize_customer_stats(customer_stats):
+    """
+    Adds the average transaction value to each customer's statistics
+    """
+    # Calculate average transaction value for each customer (values only, no key lookups)
+    for stats in customer_stats.values():
+        transaction_count = stats['transaction_count']
+        stats['avg_transaction_value'] = (
+            round(stats['total_spent'] / transaction_count, 2) if transaction_count > 0 else 0.0
+        )
     
     return customer_stats
 
 
-def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
+def analyze_all(transactions, top_n=5, low_threshold=10):
+    """
+    Runs every sales analysis over a single shared view of the transactions
+    
+    Args:
+        transactions (list or TransactionColumns): Transactions to analyze
+        top_n (int): Number of top products to return (default: 5)
+        low_threshold (int): Quantity threshold for low performing products (default: 10)
+    
+    Returns: dictionary with one entry per analysis
+    Expected Output Format:
+    {
+        'total_revenue': 1545000.50,                # calculate_total_revenue()
+        'peak_day': ('2024-12-15', 185000.0, 12),   # find_peak_sales_day()
+        'daily_trend': {...},                       # daily_sales_trend()
+        'region_stats': {...},                      # region_wise_sales()
+        'top_products': [...],                      # top_selling_products(n=top_n)
+        'low_products': [...],                      # low_performing_products(threshold=low_threshold)
+        'customer_stats': {...}                     # customer_analysis()
+    }
+    
+    Each entry matches the output of the corresponding individual function.
+    Each field is extracted into a column once and each grouping (e.g. revenue
+    by date) is computed once, then shared by the analyses that need it; the
+    column extraction and groupings are still separate passes.
+    """
+    # One shared column view: each field is extracted once and each grouping
+    # (e.g. revenue by date) is computed once and reused
+    columns = _as_columns(transactions)
+    
+    return {
+        'total_revenue': calculate_total_revenue(columns),
+        'peak_day': find_peak_sales_day(columns),
+        'daily_trend': daily_sales_trend(columns),
+        'region_stats': region_wise_sales(columns),
+        'top_products': top_selling_products(columns, n=top_n),
+        'low_products': low_performing_products(columns, threshold=low_threshold),
+        'customer_stats': customer_analysis(columns)
+    }
+
+
+def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt', analysis=None):
     """
     Generates a comprehensive formatted text report
 
@@ -484,49 +537,53 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     South     ₹3,80,000     24.60%      22
     ...
     
+    Pass analysis (the result of analyze_all(transactions, top_n=5, low_threshold=10))
+    to reuse analyses that were already run instead of recomputing them.
     """
-    import os
     from datetime import datetime
     
     # Create output directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
+    ensure_parent_dir(output_file)
     
     # Get current date and time
     current_datetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
+    # Run every analysis over one shared column view, unless the caller already did
+    if analysis is None:
+        analysis = analyze_all(transactions, top_n=5, low_threshold=10)
+    
     # Calculate overall summary
-    total_revenue = calculate_total_revenue(transactions)
+    total_revenue = analysis['total_revenue']
     total_transactions = len(transactions)
     avg_order_value = total_revenue / total_transactions if total_transactions > 0 else 0.0
     
-    # Get date range
-    dates = [t.get('Date', '') for t in transactions if t.get('Date')]
-    min_date = min(dates) if dates else 'N/A'
-    max_date = max(dates) if dates else 'N/A'
+    # Get daily sales trend
+    daily_trend = analysis['daily_trend']
+    
+    # Get date range from the distinct dates of the daily trend
+    min_date = min(daily_trend) if daily_trend else 'N/A'
+    max_date = max(daily_trend) if daily_trend else 'N/A'
     
     # Get region-wise performance
-    region_stats = region_wise_sales(transactions)
+    region_stats = analysis['region_stats']
     
     # Get top 5 products
-    top_products = top_selling_products(transactions, n=5)
+    top_products = analysis['top_products'][:5]
     
     # Get top 5 customers
-    customer_stats = customer_analysis(transactions)
-    top_customers = sorted(
-        [(cid, stats['total_spent'], stats['transaction_count']) 
-         for cid, stats in customer_stats.items()],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-    
-    # Get daily sales trend
-    daily_trend = daily_sales_trend(transactions)
+    customer_stats = analysis['customer_stats']
+    top_customers = heapq.nlargest(
+        5,
+        ((cid, stats['total_spent'], stats['transaction_count'])
+         for cid, stats in customer_stats.items()),
+        key=lambda x: x[1]
+    )
     
     # Get peak sales day
-    peak_day = find_peak_sales_day(transactions)
+    peak_day = analysis['peak_day']
     
     # Get low performing products
-    low_products = low_performing_products(transactions, threshold=10)
+    low_products = analysis['low_products']
     
     # Calculate average transaction value per region
     region_avg_value = {}
@@ -537,19 +594,17 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
             region_avg_value[region] = 0.0
     
     # API Enrichment Summary
-    enriched_count = sum(1 for t in enriched_transactions if t.get('API_Match', False))
+    # Count matches and collect the distinct unmatched product names in one pass
+    enriched_count = 0
+    unenriched_products = set()
+    for t in enriched_transactions:
+        if t.get('API_Match', False):
+            enriched_count += 1
+        else:
+            unenriched_products.add(t.get('ProductName', 'Unknown'))
     total_enriched = len(enriched_transactions)
     success_rate = (enriched_count / total_enriched * 100) if total_enriched > 0 else 0.0
-    unenriched_products = [
-        t.get('ProductName', 'Unknown') 
-        for t in enriched_transactions 
-        if not t.get('API_Match', False)
-    ]
-    unique_unenriched = sorted(set(unenriched_products))
-    
-    # Format currency with Indian numbering
-    def format_currency(amount):
-        return f"₹{amount:,.2f}".replace(',', ',')
+    unique_unenriched = sorted(unenriched_products)
     
     # Start building report
     report_lines = []
@@ -565,9 +620,9 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     # 2. OVERALL SUMMARY
     report_lines.append("OVERALL SUMMARY")
     report_lines.append("-" * 50)
-    report_lines.append(f"Total Revenue:        {format_currency(total_revenue)}")
+    report_lines.append(f"Total Revenue:        {_format_currency(total_revenue)}")
     report_lines.append(f"Total Transactions:   {total_transactions}")
-    report_lines.append(f"Average Order Value:  {format_currency(avg_order_value)}")
+    report_lines.append(f"Average Order Value:  {_format_currency(avg_order_value)}")
     report_lines.append(f"Date Range:           {min_date} to {max_date}")
     report_lines.append("")
     
@@ -577,7 +632,7 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     report_lines.append(f"{'Region':<12} {'Sales':<15} {'% of Total':<12} {'Transactions':<12}")
     report_lines.append("-" * 50)
     for region, stats in region_stats.items():
-        sales_str = format_currency(stats['total_sales'])
+        sales_str = _format_currency(stats['total_sales'])
         percentage = stats.get('percentage', 0.0)
         trans_count = stats['transaction_count']
         report_lines.append(f"{region:<12} {sales_str:<15} {percentage:>6.2f}%      {trans_count:<12}")
@@ -590,7 +645,7 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     report_lines.append("-" * 50)
     for rank, (product_name, quantity, revenue) in enumerate(top_products, 1):
         product_name_short = product_name[:24] if len(product_name) > 24 else product_name
-        report_lines.append(f"{rank:<6} {product_name_short:<25} {quantity:<15} {format_currency(revenue)}")
+        report_lines.append(f"{rank:<6} {product_name_short:<25} {quantity:<15} {_format_currency(revenue)}")
     report_lines.append("")
     
     # 5. TOP 5 CUSTOMERS
@@ -599,7 +654,7 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     report_lines.append(f"{'Rank':<6} {'Customer ID':<15} {'Total Spent':<15} {'Order Count':<12}")
     report_lines.append("-" * 50)
     for rank, (customer_id, total_spent, order_count) in enumerate(top_customers, 1):
-        report_lines.append(f"{rank:<6} {customer_id:<15} {format_currency(total_spent)} {order_count:<12}")
+        report_lines.append(f"{rank:<6} {customer_id:<15} {_format_currency(total_spent)} {order_count:<12}")
     report_lines.append("")
     
     # 6. DAILY SALES TREND
@@ -607,9 +662,9 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     report_lines.append("-" * 50)
     report_lines.append(f"{'Date':<12} {'Revenue':<15} {'Transactions':<12} {'Unique Customers':<15}")
     report_lines.append("-" * 50)
-    for date, stats in list(daily_trend.items())[:10]:  # Show first 10 days
+    for date, stats in islice(daily_trend.items(), 10):  # Show first 10 days
         report_lines.append(
-            f"{date:<12} {format_currency(stats['revenue']):<15} "
+            f"{date:<12} {_format_currency(stats['revenue']):<15} "
             f"{stats['transaction_count']:<12} {stats['unique_customers']:<15}"
         )
     if len(daily_trend) > 10:
@@ -621,7 +676,7 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     report_lines.append("-" * 50)
     if peak_day[0]:
         report_lines.append(f"Best Selling Day:     {peak_day[0]}")
-        report_lines.append(f"  Revenue:            {format_currency(peak_day[1])}")
+        report_lines.append(f"  Revenue:            {_format_currency(peak_day[1])}")
         report_lines.append(f"  Transactions:       {peak_day[2]}")
     else:
         report_lines.append("Best Selling Day:     N/A")
@@ -633,7 +688,7 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
         report_lines.append("-" * 50)
         for product_name, quantity, revenue in low_products[:10]:  # Show top 10
             product_name_short = product_name[:24] if len(product_name) > 24 else product_name
-            report_lines.append(f"{product_name_short:<25} {quantity:<12} {format_currency(revenue)}")
+            report_lines.append(f"{product_name_short:<25} {quantity:<12} {_format_currency(revenue)}")
         if len(low_products) > 10:
             report_lines.append(f"... and {len(low_products) - 10} more products")
     else:
@@ -644,7 +699,7 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     report_lines.append(f"{'Region':<12} {'Avg Transaction Value':<20}")
     report_lines.append("-" * 50)
     for region, avg_value in sorted(region_avg_value.items(), key=lambda x: x[1], reverse=True):
-        report_lines.append(f"{region:<12} {format_currency(avg_value)}")
+        report_lines.append(f"{region:<12} {_format_currency(avg_value)}")
     report_lines.append("")
     
     # 8. API ENRICHMENT SUMMARY
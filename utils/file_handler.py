@@ -1,3 +1,28 @@
+import codecs
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Fields every valid transaction must have (with a non-empty value)
+_REQUIRED_FIELDS = ('TransactionID', 'Date', 'ProductID', 'ProductName',
+                    'Quantity', 'UnitPrice', 'CustomerID', 'Region')
+
+# Encodings tried, in order, when reading sales data files
+_ENCODINGS = ('utf-8', 'latin-1', 'cp1252')
+
+
+def ensure_parent_dir(filename):
+    """
+    Creates the parent directory of a file if it doesn't exist
+
+    Args:
+        filename (str): Path of the file about to be written
+    """
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+
 def read_sales_data(filename):
     """
     Reads sales data from file handling encoding issues
@@ -17,37 +42,125 @@ def read_sales_data(filename):
     - Skip the header row
     - Remove empty lines
     """
-    encodings_to_try = ['utf-8', 'latin-1', 'cp1252']
-    
-    for encoding in encodings_to_try:
+    try:
+        # Sniff the start of the file once to narrow down the encodings to try
+        with open(filename, 'rb') as file:
+            head = file.read(4096)
+        
+        # Stream lines from the file instead of holding a readlines() copy as well
+        return _read_data_lines(
+            filename, head,
+            lambda encoding: open(filename, 'r', encoding=encoding, buffering=1 << 20)
+        )
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Error: File '{filename}' not found.")
+
+
+def read_sales_data_many(filenames, max_workers=4):
+    """
+    Reads several sales data files, fetching their contents concurrently
+
+    Args:
+        filenames (list): Paths to the sales data files
+        max_workers (int): Maximum number of files read in parallel (default: 4)
+
+    Returns: list of raw lines from all files (header rows skipped), in the
+    order of filenames, ready for parse_transactions()
+
+    Example:
+        raw_lines = read_sales_data_many(['data/sales_jan.txt', 'data/sales_feb.txt'])
+        transactions = parse_transactions(raw_lines)
+
+    Only the file reads run in parallel (they release the GIL, which helps on
+    slow disks or network shares); decoding and line splitting run one file at
+    a time in the calling thread. Each file is handled like read_sales_data().
+    For local files that are already cached it is no faster than calling
+    read_sales_data() in a loop, and it holds the raw contents of all files.
+    """
+    data_lines = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for filename, data in zip(filenames, executor.map(_read_file_bytes, filenames)):
+            data_lines.extend(_decode_sales_data(filename, data))
+    return data_lines
+
+
+def _read_file_bytes(filename):
+    """
+    Returns the raw contents of a file
+    """
+    try:
+        with open(filename, 'rb') as file:
+            return file.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Error: File '{filename}' not found.")
+
+
+def _decode_sales_data(filename, data):
+    """
+    Decodes the raw contents of a sales data file into its data lines
+    """
+    # A text wrapper over the bytes splits lines exactly like reading the file
+    return _read_data_lines(
+        filename, data[:4096],
+        lambda encoding: io.TextIOWrapper(io.BytesIO(data), encoding=encoding)
+    )
+
+
+def _read_data_lines(filename, head, open_text):
+    """
+    Returns the data lines of a file, trying each candidate encoding in turn
+
+    open_text(encoding) must return a text file object over the file contents;
+    head is the first bytes of the file, used to narrow down the encodings.
+    """
+    for encoding in _candidate_encodings(head, _ENCODINGS):
         try:
-            with open(filename, 'r', encoding=encoding) as file:
-                lines = file.readlines()
-            
-            # Skip header row (first line) and remove empty lines
-            data_lines = []
-            for line in lines[1:]:  # Skip first line (header)
-                stripped_line = line.strip()
-                if stripped_line:  # Only add non-empty lines
-                    data_lines.append(stripped_line)
-            
-            return data_lines
-            
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Error: File '{filename}' not found.")
+            with open_text(encoding) as file:
+                return _collect_data_lines(file)
         except UnicodeDecodeError:
             # Try next encoding
             continue
-        except Exception as e:
-            # If it's not a UnicodeDecodeError, re-raise it
-            raise
     
     # If all encodings failed, raise an error
     raise ValueError(
-        f"Unable to decode file '{filename}' with any of the attempted encodings: {', '.join(encodings_to_try)}"
+        f"Unable to decode file '{filename}' with any of the attempted encodings: {', '.join(_ENCODINGS)}"
     )
 
 
+def _collect_data_lines(file):
+    """
+    Returns the stripped, non-empty lines of an open text file, skipping the header
+    """
+    data_lines = []
+    next(file, None)  # Skip first line (header)
+    
+    # Remove empty lines
+    for line in file:
+        stripped_line = line.strip()
+        if stripped_line:  # Only add non-empty lines
+            data_lines.append(stripped_line)
+    
+    return data_lines
+
+
+def _candidate_encodings(head, encodings):
+    """
+    Narrows the encodings to try using the first bytes of a file
+
+    Bytes that are already invalid UTF-8 rule out 'utf-8' without decoding the
+    whole file, and a UTF-8 byte order mark selects 'utf-8-sig' instead.
+    """
+    try:
+        # Incremental decode, so a character cut off at the end of head isn't an error
+        codecs.getincrementaldecoder('utf-8')().decode(head)
+    except UnicodeDecodeError:
+        return [encoding for encoding in encodings if encoding != 'utf-8']
+    
+    if head.startswith(codecs.BOM_UTF8):
+        return ['utf-8-sig' if encoding == 'utf-8' else encoding for encoding in encodings]
+    return encodings
+
+
 def parse_transactions(raw_lines):
     """
     Parses raw lines into clean list of dictionaries
@@ -86,10 +199,8 @@ def parse_transactions(raw_lines):
     expected_fields = 8  # TransactionID, Date, ProductID, ProductName, Quantity, UnitPrice, CustomerID, Region
     
     for line in raw_lines:
-        if not line or not line.strip():
-            continue
-        
-        # Split by pipe delimiter
+        # Split by pipe delimiter (empty or blank lines give one field and are
+        # skipped by the field count check below)
         fields = line.split('|')
         
         # Skip rows with incorrect number of fields
@@ -109,19 +220,25 @@ def parse_transactions(raw_lines):
         # Handle commas in ProductName (remove commas)
         product_name = product_name.replace(',', '')
         
+        # Intern fields that repeat across transactions so rows share one string object
+        date = sys.intern(date)
+        product_id = sys.intern(product_id)
+        product_name = sys.intern(product_name)
+        customer_id = sys.intern(customer_id)
+        region = sys.intern(region)
+        
         # Remove commas from numeric fields and convert to proper types
         # Convert Quantity to int
+        # (replace only when a comma is present; int() ignores surrounding whitespace)
         try:
-            quantity_cleaned = quantity_str.replace(',', '').strip()
-            quantity = int(quantity_cleaned)
+            quantity = int(quantity_str.replace(',', '') if ',' in quantity_str else quantity_str)
         except (ValueError, AttributeError):
             # Skip if conversion fails
             continue
         
         # Convert UnitPrice to float
         try:
-            unit_price_cleaned = unit_price_str.replace(',', '').strip()
-            unit_price = float(unit_price_cleaned)
+            unit_price = float(unit_price_str.replace(',', '') if ',' in unit_price_str else unit_price_str)
         except (ValueError, AttributeError):
             # Skip if conversion fails
             continue
@@ -143,7 +260,7 @@ def parse_transactions(raw_lines):
     return transactions
 
 
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, verbose=True):
     """
     Validates transactions and applies optional filters
 
@@ -152,6 +269,7 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     - region: filter by specific region (optional)
     - min_amount: minimum transaction amount (Quantity * UnitPrice) (optional)
     - max_amount: maximum transaction amount (optional)
+    - verbose: print the regions, amount range and counts below (default: True)
 
     Returns: tuple (valid_transactions, invalid_count, filter_summary)
 
@@ -185,94 +303,99 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     valid_transactions = []
     invalid_count = 0
     
-    # Required fields
-    required_fields = ['TransactionID', 'Date', 'ProductID', 'ProductName', 
-                       'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+    # Display data about all valid transactions, gathered during the same pass
+    valid_count = 0
+    available_regions = set()
+    min_transaction_amount = None
+    max_transaction_amount = None
     
-    # Validate transactions
+    # Filter settings and counters
+    # (parsed regions are already stripped, so the filter value is normalized once
+    # and strip() is only needed for rows that don't match as-is)
+    region_key = region.strip() if region is not None else None
+    # Missing amount bounds become infinite ones, so the loop needs no None checks
+    amount_low = min_amount if min_amount is not None else float('-inf')
+    amount_high = max_amount if max_amount is not None else float('inf')
+    filtered_by_region = 0
+    filtered_by_amount = 0
+    
+    # Validate and filter transactions in a single pass
     for transaction in transactions:
-        is_valid = True
+        # Check all required fields are present and non-empty
+        if not all(map(transaction.get, _REQUIRED_FIELDS)):
+            invalid_count += 1
+            continue
         
-        # Check all required fields are present
-        for field in required_fields:
-            if field not in transaction or not transaction[field]:
-                is_valid = False
-                break
+        transaction_id = transaction['TransactionID']
+        product_id = transaction['ProductID']
+        customer_id = transaction['CustomerID']
+        quantity = transaction['Quantity']
+        unit_price = transaction['UnitPrice']
+        
+        # Check the remaining rules, stopping at the first one that fails.
+        # ID prefix checks compare the first character of the parsed (already stripped)
+        # string directly; other values fall back to str().strip()
+        is_valid = (
+            # TransactionID starts with 'T'
+            (type(transaction_id) is str and transaction_id[:1] == 'T'
+             or str(transaction_id).strip().startswith('T'))
+            # ProductID starts with 'P'
+            and (type(product_id) is str and product_id[:1] == 'P'
+                 or str(product_id).strip().startswith('P'))
+            # CustomerID starts with 'C'
+            and (type(customer_id) is str and customer_id[:1] == 'C'
+                 or str(customer_id).strip().startswith('C'))
+            # Quantity > 0
+            and isinstance(quantity, (int, float)) and not quantity <= 0
+            # UnitPrice > 0
+            and isinstance(unit_price, (int, float)) and not unit_price <= 0
+        )
         
         if not is_valid:
             invalid_count += 1
             continue
         
-        # Check TransactionID starts with 'T'
-        transaction_id = str(transaction.get('TransactionID', '')).strip()
-        if not transaction_id.startswith('T'):
-            is_valid = False
-        
-        # Check ProductID starts with 'P'
-        product_id = str(transaction.get('ProductID', '')).strip()
-        if not product_id.startswith('P'):
-            is_valid = False
+        # Track available regions and amount range (min/max keep the first of equal values)
+        valid_count += 1
+        transaction_amount = quantity * unit_price
+        transaction_region = transaction['Region']
+        available_regions.add(transaction_region)
+        if min_transaction_amount is None:
+            min_transaction_amount = max_transaction_amount = transaction_amount
+        elif transaction_amount < min_transaction_amount:
+            min_transaction_amount = transaction_amount
+        elif transaction_amount > max_transaction_amount:
+            max_transaction_amount = transaction_amount
         
-        # Check CustomerID starts with 'C'
-        customer_id = str(transaction.get('CustomerID', '')).strip()
-        if not customer_id.startswith('C'):
-            is_valid = False
-        
-        # Check Quantity > 0
-        quantity = transaction.get('Quantity')
-        if not isinstance(quantity, (int, float)) or quantity <= 0:
-            is_valid = False
+        # Apply region filter
+        if region_key is not None and transaction_region != region_key and transaction_region.strip() != region_key:
+            filtered_by_region += 1
+            continue
         
-        # Check UnitPrice > 0
-        unit_price = transaction.get('UnitPrice')
-        if not isinstance(unit_price, (int, float)) or unit_price <= 0:
-            is_valid = False
+        # Apply amount filters
+        if transaction_amount < amount_low or transaction_amount > amount_high:
+            filtered_by_amount += 1
+            continue
         
-        if is_valid:
-            valid_transactions.append(transaction)
-        else:
-            invalid_count += 1
+        valid_transactions.append(transaction)
     
-    # Display available regions
-    if valid_transactions:
-        regions = sorted(set(t.get('Region', '') for t in valid_transactions if t.get('Region')))
-        print(f"\nAvailable regions: {', '.join(regions)}")
-        
-        # Calculate and display transaction amount range
-        amounts = [t.get('Quantity', 0) * t.get('UnitPrice', 0) for t in valid_transactions]
-        if amounts:
-            min_transaction_amount = min(amounts)
-            max_transaction_amount = max(amounts)
+    if verbose:
+        # Display available regions
+        if valid_count:
+            print(f"\nAvailable regions: {', '.join(sorted(available_regions))}")
+            
+            # Display transaction amount range
             print(f"Transaction amount range: ${min_transaction_amount:,.2f} - ${max_transaction_amount:,.2f}")
-    
-    print(f"\nTotal input transactions: {total_input}")
-    print(f"Valid transactions after validation: {len(valid_transactions)}")
-    print(f"Invalid transactions: {invalid_count}")
-    
-    # Apply region filter
-    filtered_by_region = 0
-    if region is not None:
-        before_region_filter = len(valid_transactions)
-        valid_transactions = [t for t in valid_transactions if t.get('Region', '').strip() == region.strip()]
-        filtered_by_region = before_region_filter - len(valid_transactions)
-        print(f"After region filter ('{region}'): {len(valid_transactions)} transactions")
-    
-    # Apply amount filters
-    filtered_by_amount = 0
-    if min_amount is not None or max_amount is not None:
-        before_amount_filter = len(valid_transactions)
-        filtered_transactions = []
-        for t in valid_transactions:
-            transaction_amount = t.get('Quantity', 0) * t.get('UnitPrice', 0)
-            if min_amount is not None and transaction_amount < min_amount:
-                continue
-            if max_amount is not None and transaction_amount > max_amount:
-                continue
-            filtered_transactions.append(t)
         
-        filtered_by_amount = before_amount_filter - len(filtered_transactions)
-        valid_transactions = filtered_transactions
-        print(f"After amount filter (min: {min_amount}, max: {max_amount}): {len(valid_transactions)} transactions")
+        print(f"\nTotal input transactions: {total_input}")
+        print(f"Valid transactions after validation: {valid_count}")
+        print(f"Invalid transactions: {invalid_count}")
+        
+        # Report the counts after each filter
+        if region is not None:
+            print(f"After region filter ('{region}'): {valid_count - filtered_by_region} transactions")
+        if min_amount is not None or max_amount is not None:
+            print(f"After amount filter (min: {min_amount}, max: {max_amount}): {len(valid_transactions)} transactions")
     
     final_count = len(valid_transactions)
     
@@ -286,4 +409,3 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     }
     
     return valid_transactions, invalid_count, filter_summary
-